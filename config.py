@@ -5,25 +5,35 @@ Replace placeholder values with your actual API credentials.
 """
 
 import os
-from typing import List
+import types
+from typing import Tuple
 
 # =============================================================================
 # TWITTER/X API CREDENTIALS
 # Get these from: https://developer.twitter.com/en/portal/dashboard
 # IMPORTANT: Never put real API keys here! Use environment variables or GitHub Secrets
 # =============================================================================
-TWITTER_API_KEY = os.getenv('TWITTER_API_KEY', '')
-TWITTER_API_SECRET = os.getenv('TWITTER_API_SECRET', '')
-TWITTER_ACCESS_TOKEN = os.getenv('TWITTER_ACCESS_TOKEN', '')
-TWITTER_ACCESS_TOKEN_SECRET = os.getenv('TWITTER_ACCESS_TOKEN_SECRET', '')
-TWITTER_BEARER_TOKEN = os.getenv('TWITTER_BEARER_TOKEN', '')
+# Read once at import; everything else uses this read-only snapshot
+_ENV = types.MappingProxyType({
+    name: os.environ.get(name, '')
+    for name in (
+        'TWITTER_API_KEY', 'TWITTER_API_SECRET', 'TWITTER_ACCESS_TOKEN',
+        'TWITTER_ACCESS_TOKEN_SECRET', 'TWITTER_BEARER_TOKEN'
+    )
+})
+
+TWITTER_API_KEY = _ENV['TWITTER_API_KEY']
+TWITTER_API_SECRET = _ENV['TWITTER_API_SECRET']
+TWITTER_ACCESS_TOKEN = _ENV['TWITTER_ACCESS_TOKEN']
+TWITTER_ACCESS_TOKEN_SECRET = _ENV['TWITTER_ACCESS_TOKEN_SECRET']
+TWITTER_BEARER_TOKEN = _ENV['TWITTER_BEARER_TOKEN']
 
 # =============================================================================
 # UNSPLASH API (for crypto-related images)
 # Get free API key from: https://unsplash.com/developers
 # IMPORTANT: Never put real API keys here! Use environment variables or GitHub Secrets
 # =============================================================================
-UNSPLASH_ACCESS_KEY = os.getenv('UNSPLASH_ACCESS_KEY', '')
+UNSPLASH_ACCESS_KEY = os.environ.get('UNSPLASH_ACCESS_KEY', '')
 
 # =============================================================================
 # NEWS SOURCES CONFIGURATION
@@ -56,25 +66,25 @@ NEWS_SOURCES = {
 # CRYPTO HASHTAGS
 # Add or remove hashtags as needed. Bot will randomly select 2-3 per tweet.
 # =============================================================================
-CRYPTO_HASHTAGS: List[str] = [
+CRYPTO_HASHTAGS: Tuple[str, ...] = (
     '#Bitcoin', '#BTC', '#Ethereum', '#ETH', '#Crypto', '#Cryptocurrency',
     '#Blockchain', '#DeFi', '#Web3', '#Altcoin', '#Trading', '#Investing',
-    '#HODL', '#Binance', '#Coinbase', '#NFT', '#Solana', '#Cardano', 'Oozhai',
+    '#HODL', '#Binance', '#Coinbase', '#NFT', '#Solana', '#Cardano', '#Oozhai',
     '#Polkadot', '#Chainlink', '#CryptoNews', '#DigitalAssets', '#Fintech',
     '#Metaverse', '#GameFi', '#Yield', '#Staking', '#Layer2', '#Lightning'
-]
+)
 
 # =============================================================================
 # CRYPTO TWITTER ACCOUNTS TO MENTION
 # Bot will randomly mention one account per tweet. Include @ symbol.
 # =============================================================================
-CRYPTO_ACCOUNTS: List[str] = [
+CRYPTO_ACCOUNTS: Tuple[str, ...] = (
     '@CoinTelegraph', '@CoinDesk', '@cz_binance', '@elonmusk', '@VitalikButerin',
     '@aantonop', '@APompliano', '@naval', '@balajis',
     '@CryptoWendyO', '@DocumentingBTC', '@Bitcoin', '@ethereum', '@solana',
     '@cardano', '@Polkadot', '@chainlink', '@MessariCrypto', '@glassnode',
     '@CryptoBirb', '@TheCryptoDog', '@CoinGecko', '@CoinMarketCap'
-]
+)
 
 # =============================================================================
 # POSTING SCHEDULE CONFIGURATION
@@ -114,12 +124,12 @@ CONTENT_SETTINGS = {
     'attach_images': True,
     
     # Unsplash search terms for crypto images (expanded list for variety)
-    'image_keywords': [
+    'image_keywords': (
         'cryptocurrency', 'bitcoin', 'blockchain', 'finance', 'technology',
         'digital currency', 'trading', 'investment', 'fintech', 'money',
         'ethereum', 'crypto trading', 'financial technology', 'digital finance',
         'market analysis', 'crypto coins', 'digital assets', 'defi'
-    ]
+    )
 }
 
 # =============================================================================
@@ -152,21 +162,22 @@ LOGGING_CONFIG = {
 # =============================================================================
 # VALIDATION FUNCTION
 # =============================================================================
+# Built once at import: (value that must be truthy, error message) pairs.
+# Placeholder credentials are folded to '' so they fail like missing ones.
+_VALIDATION_PLAN = tuple(
+    ('' if value == f'your_{name.lower()}_here' else value,
+     f"Twitter API key {name} not configured")
+    for name, value in _ENV.items()
+) + (
+    (NEWS_SOURCES, "No news sources configured"),
+    (CRYPTO_HASHTAGS, "No hashtags configured"),
+)
+
 def validate_config():
     """Validate that all required configuration is present."""
-    required_twitter_keys = [
-        TWITTER_API_KEY, TWITTER_API_SECRET, TWITTER_ACCESS_TOKEN,
-        TWITTER_ACCESS_TOKEN_SECRET, TWITTER_BEARER_TOKEN
-    ]
-    
-    if any(key == f'your_{key.lower()}_here' for key in required_twitter_keys):
-        return False, "Twitter API keys not configured"
-    
-    if not NEWS_SOURCES:
-        return False, "No news sources configured"
-    
-    if not CRYPTO_HASHTAGS:
-        return False, "No hashtags configured"
+    for value, message in _VALIDATION_PLAN:
+        if not value:
+            return False, message
     
     return True, "Configuration valid"
 
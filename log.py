@@ -0,0 +1,20 @@
+"""
+Logging setup for Crypto News Twitter Bot
+Configures the root logger once, from whichever entry point is running;
+modules only create their own loggers with logging.getLogger(__name__)
+"""
+
+import logging
+import sys
+from config import LOGGING_CONFIG
+
+def setup_logging():
+    """Setup logging configuration."""
+    logging.basicConfig(
+        level=getattr(logging, LOGGING_CONFIG['log_level']),
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler(LOGGING_CONFIG['log_file']),
+            logging.StreamHandler(sys.stdout)
+        ]
+    )
@@ -4,96 +4,189 @@ Coordinates news fetching, rewriting, and posting with scheduling
 UPDATED FOR HIGH VOLUME POSTING (48 tweets/day)
 """
 
-import schedule
 import time
+import atexit
 import logging
 import random
+import re
+from bisect import bisect_right
 from datetime import datetime, timedelta
-from typing import List, Optional
-import sys
-import signal
+from typing import List, Optional, TYPE_CHECKING
+import threading
 import json
 import os
+from collections import OrderedDict
+from dataclasses import dataclass, field, fields, asdict
+from pathlib import Path
 
-# Import bot modules
-from news_fetcher import CryptoNewsFetcher, NewsItem
-from rewriter import TweetRewriter
-from twitter_bot import TwitterBotManager
+# Bot modules (and signal) are imported where they are used so that
+# short CLI invocations like --stats don't pay for them
 from config import (
-    POSTING_SCHEDULE, CONTENT_SETTINGS, LOGGING_CONFIG,
+    POSTING_SCHEDULE, CONTENT_SETTINGS,
     validate_config, ERROR_SETTINGS
 )
+from log import setup_logging
 
-time.sleep(180)  # wait 3 minutes between tweets
+if TYPE_CHECKING:
+    from news_fetcher import NewsItem
 
-# Configure logging
-def setup_logging():
-    """Setup logging configuration."""
-    logging.basicConfig(
-        level=getattr(logging, LOGGING_CONFIG['log_level']),
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler(LOGGING_CONFIG['log_file']),
-            logging.StreamHandler(sys.stdout)
-        ]
-    )
+STATS_FILE = 'bot_stats.json'
+STATS_FLUSH_INTERVAL = 10  # Write stats to disk every N posts (and on exit)
+MAX_SLEEP_SECONDS = 300  # Upper bound on one main-loop wait (picks up clock changes)
+
+# Map keywords in article titles to image search terms
+IMAGE_KEYWORD_MAP = {
+    'bitcoin': 'bitcoin',
+    'btc': 'bitcoin',
+    'ethereum': 'ethereum',
+    'eth': 'ethereum',
+    'crypto': 'cryptocurrency',
+    'defi': 'decentralized finance',
+    'nft': 'nft blockchain',
+    'trading': 'crypto trading',
+    'market': 'financial market',
+    'regulation': 'finance regulation',
+    'adoption': 'blockchain technology',
+    'investment': 'investment finance'
+}
+# Longest keywords first so 'ethereum' wins over 'eth'; only anchored at
+# the word start so plurals like 'markets' still match
+_IMAGE_KEYWORD_RE = re.compile(
+    r'\b(' + '|'.join(
+        map(re.escape, sorted(IMAGE_KEYWORD_MAP, key=len, reverse=True))
+    ) + ')'
+)
 
+# Configure logging
 setup_logging()
 logger = logging.getLogger(__name__)
 
+@dataclass
+class BotStats:
+    """Posting counters persisted to bot_stats.json."""
+    total_posts: int = 0
+    successful_posts: int = 0
+    failed_posts: int = 0
+    last_post_time: Optional[datetime] = None
+    start_time: datetime = field(default_factory=datetime.now)
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> 'BotStats':
+        """Build stats from saved JSON data, ignoring unknown keys."""
+        stats = cls(**{
+            f.name: data[f.name] for f in fields(cls)
+            if data.get(f.name) is not None
+        })
+        if isinstance(stats.last_post_time, str):
+            stats.last_post_time = datetime.fromisoformat(stats.last_post_time)
+        if isinstance(stats.start_time, str):
+            stats.start_time = datetime.fromisoformat(stats.start_time)
+        return stats
+
+def load_stats_file(path: str = STATS_FILE) -> BotStats:
+    """Load bot statistics from file, starting fresh counters if missing."""
+    try:
+        if os.path.exists(path):
+            with open(path, 'r') as f:
+                return BotStats.from_dict(json.load(f))
+    except Exception as e:
+        logger.warning("Could not load stats: %s", e)
+    
+    return BotStats()
+
+def print_stats(stats: BotStats, articles_posted: int = 0, next_run: Optional[datetime] = None):
+    """Print bot statistics."""
+    uptime = datetime.now() - stats.start_time
+    success_rate = (
+        (stats.successful_posts / stats.total_posts * 100) 
+        if stats.total_posts > 0 else 0
+    )
+    
+    print(f"\n=== Crypto News Bot Statistics ===")
+    print(f"Uptime: {uptime}")
+    print(f"Total posts attempted: {stats.total_posts}")
+    print(f"Successful posts: {stats.successful_posts}")
+    print(f"Failed posts: {stats.failed_posts}")
+    print(f"Success rate: {success_rate:.1f}%")
+    print(f"Last post: {stats.last_post_time or 'Never'}")
+    print(f"Articles posted: {articles_posted}")
+    print(f"Next scheduled run: {next_run or 'Not scheduled'}")
+    print("=" * 40)
+
+def build_schedule_slots(posting_schedule: dict) -> tuple:
+    """Turn the posting schedule config into sorted seconds-since-midnight."""
+    post_times = posting_schedule.get('post_times', [])
+    
+    if not post_times:
+        # Distribute posts evenly throughout the day
+        posts_per_day = posting_schedule.get('posts_per_day', 3)
+        
+        if posts_per_day == 1:
+            post_times = ["12:00"]
+        elif posts_per_day == 2:
+            post_times = ["09:00", "18:00"]
+        elif posts_per_day == 3:
+            post_times = ["09:00", "14:00", "19:00"]
+        else:
+            # For more than 3 posts, distribute every few hours
+            interval_hours = 24 // posts_per_day
+            post_times = [
+                f"{(8 + i * interval_hours) % 24:02d}:00"  # Start at 8 AM
+                for i in range(posts_per_day)
+            ]
+    
+    return tuple(sorted({
+        int(hour) * 3600 + int(minute) * 60
+        for hour, minute in (t.split(':') for t in post_times)
+    }))
+
+# The schedule is static config, so parse it once at import
+_SCHEDULE_SLOTS = build_schedule_slots(POSTING_SCHEDULE)
+
 class CryptoNewsBot:
     """Main bot class that orchestrates all components."""
     
     def __init__(self):
+        from news_fetcher import CryptoNewsFetcher
+        from rewriter import TweetRewriter
+        from twitter_bot import TwitterBotManager
+        
         self.news_fetcher = CryptoNewsFetcher()
         self.rewriter = TweetRewriter()
         self.twitter_bot = TwitterBotManager()
-        self.is_running = False
-        self.posted_articles = set()  # Track posted articles to avoid duplicates
-        self.stats = {
-            'total_posts': 0,
-            'successful_posts': 0,
-            'failed_posts': 0,
-            'last_post_time': None,
-            'start_time': datetime.now()
-        }
+        self._stop = threading.Event()  # Set by signal_handler to end the main loop
+        self.post_seconds = ()  # Daily post times as seconds since midnight
+        self.next_run = None
+        # Track posted articles to avoid duplicates, keyed by hash(url)
+        # (insertion-ordered, oldest first)
+        self.posted_articles = OrderedDict()
+        self.max_posted_articles = 2000
         
         # Load previous stats if they exist
         self.load_stats()
+        self._unsaved_posts = 0
+        atexit.register(self.flush_stats)
     
     def load_stats(self):
         """Load bot statistics from file."""
-        try:
-            if os.path.exists('bot_stats.json'):
-                with open('bot_stats.json', 'r') as f:
-                    saved_stats = json.load(f)
-                    self.stats.update(saved_stats)
-                    if self.stats['last_post_time']:
-                        self.stats['last_post_time'] = datetime.fromisoformat(
-                            self.stats['last_post_time']
-                        )
-                    if self.stats['start_time']:
-                        self.stats['start_time'] = datetime.fromisoformat(
-                            self.stats['start_time']
-                        )
-        except Exception as e:
-            logger.warning(f"Could not load stats: {e}")
+        self.stats = load_stats_file()
     
     def save_stats(self):
         """Save bot statistics to file."""
         try:
-            stats_to_save = self.stats.copy()
-            if stats_to_save['last_post_time']:
-                stats_to_save['last_post_time'] = stats_to_save['last_post_time'].isoformat()
-            if stats_to_save['start_time']:
-                stats_to_save['start_time'] = stats_to_save['start_time'].isoformat()
-            
-            with open('bot_stats.json', 'w') as f:
-                json.dump(stats_to_save, f, indent=2)
+            Path(STATS_FILE).write_text(
+                json.dumps(asdict(self.stats), default=datetime.isoformat)
+            )
+            self._unsaved_posts = 0
         except Exception as e:
-            logger.warning(f"Could not save stats: {e}")
+            logger.warning("Could not save stats: %s", e)
     
-    def select_news_for_posting(self, count: int = 1) -> List[NewsItem]:
+    def flush_stats(self):
+        """Save bot statistics if any posts were recorded since the last save."""
+        if self._unsaved_posts:
+            self.save_stats()
+    
+    def select_news_for_posting(self, count: int = 1) -> List['NewsItem']:
         """
         Select news articles for posting, avoiding duplicates.
         UPDATED: Expanded search for high-volume posting
@@ -116,29 +209,34 @@ class CryptoNewsBot:
                 logger.error("No news articles available")
                 return []
             
-            # Filter out already posted articles
-            available_news = [
-                item for item in all_news 
-                if item.url not in self.posted_articles
-            ]
+            # Skip already posted articles and pick random ones in a single
+            # pass (reservoir sampling), without building a filtered list
+            selected_news = []
+            available_count = 0
+            for item in all_news:
+                if hash(item.url) in self.posted_articles:
+                    continue
+                available_count += 1
+                if len(selected_news) < count:
+                    selected_news.append(item)
+                else:
+                    j = random.randrange(available_count)
+                    if j < count:
+                        selected_news[j] = item
             
-            if not available_news:
+            if not available_count:
                 logger.warning("All recent articles already posted, clearing history")
                 self.posted_articles.clear()
-                available_news = all_news
-            
-            # Select random articles
-            selected_count = min(count, len(available_news))
-            selected_news = random.sample(available_news, selected_count)
+                selected_news = random.sample(all_news, min(count, len(all_news)))
             
-            logger.info(f"Selected {len(selected_news)} articles for posting")
+            logger.info("Selected %s articles for posting", len(selected_news))
             return selected_news
             
         except Exception as e:
-            logger.error(f"Error selecting news for posting: {e}")
+            logger.error("Error selecting news for posting: %s", e)
             return []
     
-    def create_and_post_tweet(self, news_item: NewsItem) -> bool:
+    def create_and_post_tweet(self, news_item: 'NewsItem') -> bool:
         """
         Create and post a tweet from a news item.
         
@@ -149,7 +247,12 @@ class CryptoNewsBot:
             True if successful, False otherwise
         """
         try:
-            logger.info(f"Creating tweet for: {news_item.title}")
+            logger.info("Creating tweet for: %s", news_item.title)
+            
+            # Select image keyword based on content, and start fetching the
+            # image in the background while the text is written
+            image_keyword = self.select_image_keyword(news_item.title.casefold())
+            media_future = self.twitter_bot.prefetch_media(image_keyword)
             
             # Create tweet content
             tweet_text = self.rewriter.create_complete_tweet(
@@ -158,62 +261,52 @@ class CryptoNewsBot:
                 url=news_item.url
             )
             
-            # Select image keyword based on content
-            image_keyword = self.select_image_keyword(news_item.title)
-            
             # Post tweet
             success = self.twitter_bot.post_crypto_news(
                 tweet_text=tweet_text,
                 news_url=news_item.url,
-                image_keyword=image_keyword
+                image_keyword=image_keyword,
+                media_future=media_future
             )
             
             if success:
                 # Mark as posted
-                self.posted_articles.add(news_item.url)
+                self.remember_posted(news_item.url)
                 
                 # Update stats
-                self.stats['successful_posts'] += 1
-                self.stats['last_post_time'] = datetime.now()
+                self.stats.successful_posts += 1
+                self.stats.last_post_time = datetime.now()
                 
-                logger.info(f"Successfully posted tweet for: {news_item.title}")
+                logger.info("Successfully posted tweet for: %s", news_item.title)
                 return True
             else:
-                self.stats['failed_posts'] += 1
-                logger.error(f"Failed to post tweet for: {news_item.title}")
+                self.stats.failed_posts += 1
+                logger.error("Failed to post tweet for: %s", news_item.title)
                 return False
                 
         except Exception as e:
-            logger.error(f"Error creating/posting tweet: {e}")
-            self.stats['failed_posts'] += 1
+            logger.error("Error creating/posting tweet: %s", e)
+            self.stats.failed_posts += 1
             return False
         finally:
-            self.stats['total_posts'] += 1
-            self.save_stats()
+            self.stats.total_posts += 1
+            self._unsaved_posts += 1
+            if self._unsaved_posts >= STATS_FLUSH_INTERVAL:
+                self.save_stats()
     
-    def select_image_keyword(self, title: str) -> str:
-        """Select appropriate image keyword based on article title."""
-        title_lower = title.lower()
-        
-        # Map keywords in title to image search terms
-        keyword_map = {
-            'bitcoin': 'bitcoin',
-            'btc': 'bitcoin',
-            'ethereum': 'ethereum',
-            'eth': 'ethereum',
-            'crypto': 'cryptocurrency',
-            'defi': 'decentralized finance',
-            'nft': 'nft blockchain',
-            'trading': 'crypto trading',
-            'market': 'financial market',
-            'regulation': 'finance regulation',
-            'adoption': 'blockchain technology',
-            'investment': 'investment finance'
-        }
-        
-        for keyword, image_term in keyword_map.items():
-            if keyword in title_lower:
-                return image_term
+    def remember_posted(self, url: str):
+        """Record a posted article URL, evicting the oldest beyond the cap."""
+        key = hash(url)
+        self.posted_articles[key] = None
+        self.posted_articles.move_to_end(key)
+        if len(self.posted_articles) > self.max_posted_articles:
+            self.posted_articles.popitem(last=False)
+    
+    def select_image_keyword(self, title_cf: str) -> str:
+        """Select appropriate image keyword based on a casefolded article title."""
+        match = _IMAGE_KEYWORD_RE.search(title_cf)
+        if match:
+            return IMAGE_KEYWORD_MAP[match.group(1)]
         
         # Default fallback
         return random.choice(CONTENT_SETTINGS['image_keywords'])
@@ -228,6 +321,8 @@ class CryptoNewsBot:
                 logger.info("Skipping post due to recent activity")
                 return
             
+            self.twitter_bot.prepare()
+            
             # Select news to post
             news_items = self.select_news_for_posting(count=1)
             
@@ -247,14 +342,14 @@ class CryptoNewsBot:
                 logger.error("All selected articles failed to post")
             
         except Exception as e:
-            logger.error(f"Error in scheduled posting: {e}")
+            logger.error("Error in scheduled posting: %s", e)
     
     def should_skip_posting(self) -> bool:
         """Check if we should skip posting due to recent activity."""
-        if not self.stats['last_post_time']:
+        if not self.stats.last_post_time:
             return False
         
-        time_since_last_post = datetime.now() - self.stats['last_post_time']
+        time_since_last_post = datetime.now() - self.stats.last_post_time
         min_interval = timedelta(hours=POSTING_SCHEDULE['min_hours_between_posts'])
         
         return time_since_last_post < min_interval
@@ -270,7 +365,13 @@ class CryptoNewsBot:
         Returns:
             True if at least one tweet was posted successfully
         """
-        logger.info(f"Manual posting triggered for {count} tweets")
+        logger.info("Manual posting triggered for %s tweets", count)
+        
+        try:
+            self.twitter_bot.prepare()
+        except Exception as e:
+            logger.error("Could not set up the Twitter client: %s", e)
+            return False
         
         news_items = self.select_news_for_posting(count=count)
         if not news_items:
@@ -285,70 +386,66 @@ class CryptoNewsBot:
                 if len(news_items) > 1:
                     time.sleep(10)  # Reduced from 30 to 10 seconds for faster posting
         
-        logger.info(f"Manual posting completed: {successful_posts}/{len(news_items)} successful")
+        logger.info("Manual posting completed: %s/%s successful", successful_posts, len(news_items))
         return successful_posts > 0
     
     def setup_schedule(self):
         """Setup the posting schedule."""
         logger.info("Setting up posting schedule...")
         
-        post_times = POSTING_SCHEDULE.get('post_times', [])
+        for seconds in _SCHEDULE_SLOTS:
+            logger.info("Scheduled daily post at %02d:%02d", seconds // 3600, seconds % 3600 // 60)
         
-        if post_times:
-            # Schedule at specific times
-            for post_time in post_times:
-                schedule.every().day.at(post_time).do(self.post_scheduled_content)
-                logger.info(f"Scheduled daily post at {post_time}")
-        else:
-            # Distribute posts evenly throughout the day
-            posts_per_day = POSTING_SCHEDULE.get('posts_per_day', 3)
-            
-            if posts_per_day == 1:
-                schedule.every().day.at("12:00").do(self.post_scheduled_content)
-            elif posts_per_day == 2:
-                schedule.every().day.at("09:00").do(self.post_scheduled_content)
-                schedule.every().day.at("18:00").do(self.post_scheduled_content)
-            elif posts_per_day == 3:
-                schedule.every().day.at("09:00").do(self.post_scheduled_content)
-                schedule.every().day.at("14:00").do(self.post_scheduled_content)
-                schedule.every().day.at("19:00").do(self.post_scheduled_content)
-            else:
-                # For more than 3 posts, distribute every few hours
-                interval_hours = 24 // posts_per_day
-                for i in range(posts_per_day):
-                    hour = (8 + i * interval_hours) % 24  # Start at 8 AM
-                    schedule.every().day.at(f"{hour:02d}:00").do(self.post_scheduled_content)
+        self.post_seconds = _SCHEDULE_SLOTS
+        self.next_run = self.next_run_after(datetime.now())
+        
+        logger.info("Schedule setup complete. Next run: %s", self.next_run)
+    
+    def next_run_after(self, now: datetime) -> datetime:
+        """Return the first scheduled post time strictly after `now`."""
+        midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        seconds_now = (now - midnight).total_seconds()
         
-        logger.info(f"Schedule setup complete. Next run: {schedule.next_run()}")
+        i = bisect_right(self.post_seconds, seconds_now)
+        if i < len(self.post_seconds):
+            return midnight + timedelta(seconds=self.post_seconds[i])
+        return midnight + timedelta(days=1, seconds=self.post_seconds[0])
     
     def start(self):
         """Start the bot with scheduling."""
+        import signal
+        
         logger.info("Starting Crypto News Bot...")
         
         # Validate configuration
         is_valid, message = validate_config()
         if not is_valid:
-            logger.error(f"Configuration error: {message}")
+            logger.error("Configuration error: %s", message)
             return
         
         # Setup signal handlers for graceful shutdown
         signal.signal(signal.SIGINT, self.signal_handler)
         signal.signal(signal.SIGTERM, self.signal_handler)
         
-        self.is_running = True
+        self._stop.clear()
         self.setup_schedule()
         
         logger.info("Bot started successfully. Press Ctrl+C to stop.")
         
-        # Main loop
+        # Main loop: wait until the next post time. A shutdown signal sets the
+        # stop event, which ends the wait immediately.
         try:
-            while self.is_running:
-                schedule.run_pending()
-                time.sleep(60)  # Check every minute
-                
-                # Periodic cleanup
-                if random.random() < 0.01:  # 1% chance each minute
+            wait_seconds = 0
+            while not self._stop.wait(wait_seconds):
+                now = datetime.now()
+                if now >= self.next_run:
+                    self.post_scheduled_content()
                     self.cleanup()
+                    now = datetime.now()
+                    self.next_run = self.next_run_after(now)
+                    logger.info("Next run: %s", self.next_run)
+                
+                wait_seconds = min((self.next_run - now).total_seconds(), MAX_SLEEP_SECONDS)
                     
         except KeyboardInterrupt:
             logger.info("Received interrupt signal")
@@ -357,17 +454,15 @@ class CryptoNewsBot:
     
     def signal_handler(self, signum, frame):
         """Handle shutdown signals."""
-        logger.info(f"Received signal {signum}, shutting down...")
-        self.is_running = False
+        logger.info("Received signal %s, shutting down...", signum)
+        self._stop.set()
     
     def cleanup(self):
         """Perform periodic cleanup tasks.
         UPDATED: Handles more data for high-volume posting"""
         logger.debug("Performing cleanup tasks...")
         
-        # Clear old posted articles (increased limit for high-volume posting)
-        if len(self.posted_articles) > 2000:
-            self.posted_articles = set(list(self.posted_articles)[-1000:])
+        # Posted articles are bounded on insert (see remember_posted)
         
         # Cleanup Twitter bot data
         self.twitter_bot.cleanup_old_data(keep_last=50)
@@ -380,22 +475,7 @@ class CryptoNewsBot:
     
     def print_stats(self):
         """Print bot statistics."""
-        uptime = datetime.now() - self.stats['start_time']
-        success_rate = (
-            (self.stats['successful_posts'] / self.stats['total_posts'] * 100) 
-            if self.stats['total_posts'] > 0 else 0
-        )
-        
-        print(f"\n=== Crypto News Bot Statistics ===")
-        print(f"Uptime: {uptime}")
-        print(f"Total posts attempted: {self.stats['total_posts']}")
-        print(f"Successful posts: {self.stats['successful_posts']}")
-        print(f"Failed posts: {self.stats['failed_posts']}")
-        print(f"Success rate: {success_rate:.1f}%")
-        print(f"Last post: {self.stats['last_post_time'] or 'Never'}")
-        print(f"Articles posted: {len(self.posted_articles)}")
-        print(f"Next scheduled run: {schedule.next_run() or 'Not scheduled'}")
-        print("=" * 40)
+        print_stats(self.stats, len(self.posted_articles), self.next_run)
 
 def main():
     """Main entry point."""
@@ -413,12 +493,13 @@ def main():
     
     args = parser.parse_args()
     
-    bot = CryptoNewsBot()
-    
     if args.stats:
-        bot.print_stats()
+        # Stats only need the saved file, not the fetcher/rewriter/Twitter client
+        print_stats(load_stats_file())
         return
     
+    bot = CryptoNewsBot()
+    
     if args.test:
         logger.info("Running bot tests...")
         # Test each component
@@ -436,6 +517,8 @@ def main():
             print("❌ No news articles found")
         return
     
+    time.sleep(180)  # wait 3 minutes between tweets
+    
     if args.post_now:
         logger.info("Manual posting mode")
         success = bot.post_now(count=args.count)
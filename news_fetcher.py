@@ -5,28 +5,107 @@ UPDATED FOR HIGH VOLUME POSTING (more articles, longer timeframe)
 """
 
 import feedparser
+import html
+import re
+import sys
+import xml.etree.ElementTree as ET
+from email.utils import parsedate_to_datetime
 import requests
+from requests.adapters import HTTPAdapter
 import logging
-from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Optional, Tuple
 import time
 import random
+import heapq
+from dataclasses import dataclass, field
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from config import NEWS_SOURCES, ERROR_SETTINGS
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Feed entries read per source (increased from 10 to 15 for high-volume posting)
+MAX_ENTRIES_PER_FEED = 15
+
+# XML namespaces used by the ElementTree fast path
+_ATOM_NS = 'http://www.w3.org/2005/Atom'
+_MEDIA_NS = 'http://search.yahoo.com/mrss/'
+_DC_NS = 'http://purl.org/dc/elements/1.1/'
+
+def _to_naive_utc(value: datetime) -> datetime:
+    """Convert an aware datetime to naive UTC (matching feedparser's *_parsed fields)."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+class _UnparsedDateError(ValueError):
+    """An entry date the ElementTree fast path can't read; feedparser understands
+    far more date formats, so the whole feed is handed to it instead."""
+
+def _parse_iso_date(text: str) -> datetime:
+    """Parse an ISO 8601 feed date such as '2024-05-01T12:00:00Z'."""
+    text = text.strip()
+    if text.endswith(('Z', 'z')):
+        text = text[:-1] + '+00:00'
+    return _to_naive_utc(datetime.fromisoformat(text))
+
+# Word-overlap ratio at which two titles count as the same story
+TITLE_SIMILARITY_THRESHOLD = 0.7
+
+# Common prefixes that might vary between sources, ignored for duplicate detection
+_TITLE_PREFIXES = (
+    'breaking:', 'update:', 'news:', 'crypto:', 'bitcoin:',
+    'ethereum:', 'exclusive:', 'analysis:'
+)
+_TITLE_PREFIX_RE = re.compile(
+    r'(?:(?:' + '|'.join(map(re.escape, _TITLE_PREFIXES)) + r')\s*)+'
+)
+
+def _normalize_title(title: str) -> str:
+    """Lowercase a title, collapse whitespace and strip source prefixes."""
+    normalized = ' '.join(title.lower().split())
+    match = _TITLE_PREFIX_RE.match(normalized)
+    if match:
+        normalized = normalized[match.end():]
+    return normalized
+
+class _RecordingReader:
+    """File-like wrapper that keeps a copy of everything read through it, so a
+    partly consumed stream can still be handed to feedparser in full."""
+    
+    def __init__(self, raw):
+        self._raw = raw
+        self._chunks = []
+    
+    def read(self, size: int = -1) -> bytes:
+        data = self._raw.read(size)
+        self._chunks.append(data)
+        return data
+    
+    def read_all(self) -> bytes:
+        """Return the whole body: what was already read plus the unread remainder."""
+        return b''.join(self._chunks) + self._raw.read()
+
+@dataclass(eq=False)
 class NewsItem:
     """Data class to represent a news article."""
+    title: str
+    summary: str
+    url: str
+    published: datetime
+    source: str
+    image_url: Optional[str] = None
+    
+    # Precomputed once for duplicate detection
+    norm_title: str = field(init=False, repr=False)
+    token_set: frozenset = field(init=False, repr=False)
     
-    def __init__(self, title: str, summary: str, url: str, published: datetime, source: str, image_url: Optional[str] = None):
-        self.title = title
-        self.summary = summary
-        self.url = url
-        self.published = published
-        self.source = source
-        self.image_url = image_url
+    def __post_init__(self):
+        # A handful of source names shared by every article
+        self.source = sys.intern(self.source)
+        self.norm_title = _normalize_title(self.title)
+        self.token_set = frozenset(self.norm_title.split())
     
     def to_dict(self) -> Dict:
         """Convert to dictionary for easy serialization."""
@@ -48,109 +127,290 @@ class CryptoNewsFetcher:
             'User-Agent': 'CryptoNewsBot/1.0 (RSS Feed Reader)'
         })
         
+        # Feeds are fetched from several threads; give the shared session a pool
+        # large enough to keep a connection alive per host (retries are ours)
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=0)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        
+        # Per feed URL: (ETag, Last-Modified, parsed items) from the last 200 response,
+        # used for conditional GETs so unchanged feeds are neither downloaded nor parsed
+        self._feed_cache: Dict[str, Tuple[Optional[str], Optional[str], List[NewsItem]]] = {}
+        
+        # Feed workers live as long as the fetcher; threads are started on demand
+        # and then reused by every fetch instead of spinning up a pool per call
+        self._executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix='feed-fetch')
+        
     def fetch_rss_feed(self, url: str, source_name: str) -> List[NewsItem]:
         """Fetch news from an RSS feed.
         UPDATED: Gets more articles per source for high-volume posting"""
         news_items = []
+        response = None
         
         try:
-            logger.info(f"Fetching RSS feed from {source_name}: {url}")
+            logger.info("Fetching RSS feed from %s: %s", source_name, url)
+            
+            etag, last_modified, cached_items = self._feed_cache.get(url, (None, None, None))
+            headers = {}
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
             
             # Add timeout and retries
             for attempt in range(ERROR_SETTINGS['max_retries']):
                 try:
-                    response = self.session.get(url, timeout=10)
+                    # (connect, read) timeouts cap the slowest feed
+                    # Streamed, so the body is parsed as it arrives and can be abandoned early
+                    response = self.session.get(
+                        url, headers=headers, timeout=(3, 10), stream=True
+                    )
                     response.raise_for_status()
                     break
                 except requests.RequestException as e:
-                    logger.warning(f"Attempt {attempt + 1} failed for {source_name}: {e}")
+                    if response is not None:
+                        response.close()
+                    logger.warning("Attempt %s failed for %s: %s", attempt + 1, source_name, e)
                     if attempt == ERROR_SETTINGS['max_retries'] - 1:
                         raise
                     time.sleep(ERROR_SETTINGS['retry_delay'])
             
-            # Parse RSS feed
-            feed = feedparser.parse(response.content)
-            
-            if feed.bozo:
-                logger.warning(f"RSS feed from {source_name} has parsing issues")
+            if response.status_code == 304 and cached_items is not None:
+                # Feed unchanged: reuse the parsed items, dropping ones that aged out
+                cutoff = datetime.now() - timedelta(hours=48)
+                news_items = [item for item in cached_items if item.published >= cutoff]
+                logger.info("RSS feed from %s not modified, %s cached articles", source_name, len(news_items))
+                return news_items
             
-            for entry in feed.entries[:15]:  # Increased from 10 to 15 for high-volume posting
-                try:
-                    # Parse publication date
-                    published = datetime.now()
-                    if hasattr(entry, 'published_parsed') and entry.published_parsed:
-                        published = datetime(*entry.published_parsed[:6])
-                    elif hasattr(entry, 'updated_parsed') and entry.updated_parsed:
-                        published = datetime(*entry.updated_parsed[:6])
-                    
-                    # Skip articles older than 48 hours (expanded for high-volume)
-                    if published < datetime.now() - timedelta(hours=48):
-                        continue
-                    
-                    # Extract image URL if available
-                    image_url = None
-                    if hasattr(entry, 'media_content') and entry.media_content:
-                        image_url = entry.media_content[0].get('url')
-                    elif hasattr(entry, 'enclosures') and entry.enclosures:
-                        for enclosure in entry.enclosures:
-                            if enclosure.type.startswith('image/'):
-                                image_url = enclosure.href
-                                break
-                    
-                    # Create news item
-                    news_item = NewsItem(
-                        title=entry.title,
-                        summary=entry.get('summary', entry.title),
-                        url=entry.link,
-                        published=published,
-                        source=source_name,
-                        image_url=image_url
-                    )
-                    
-                    news_items.append(news_item)
-                    
-                except Exception as e:
-                    logger.error(f"Error parsing entry from {source_name}: {e}")
-                    continue
+            # Parse RSS feed: C-backed ElementTree first, feedparser for anything it can't handle
+            response.raw.decode_content = True
+            body = _RecordingReader(response.raw)
+            try:
+                news_items = self._fast_parse(body, source_name)
+            except Exception as e:
+                logger.warning("Fast parse failed for %s (%s), falling back to feedparser", source_name, e)
+                news_items = self._feedparser_parse(body.read_all(), source_name)
             
-            logger.info(f"Successfully fetched {len(news_items)} articles from {source_name}")
+            self._feed_cache[url] = (
+                response.headers.get('ETag'),
+                response.headers.get('Last-Modified'),
+                news_items
+            )
+            logger.info("Successfully fetched %s articles from %s", len(news_items), source_name)
             
         except Exception as e:
-            logger.error(f"Error fetching RSS feed from {source_name}: {e}")
+            logger.error("Error fetching RSS feed from %s: %s", source_name, e)
             if not ERROR_SETTINGS['continue_on_source_error']:
                 raise
+        finally:
+            # A body abandoned after MAX_ENTRIES_PER_FEED entries can't be handed back
+            # to the pool, so closing it drops the connection: feeds longer than that
+            # pay a fresh connect on every fetch. Fully read bodies (short feeds, 304s)
+            # keep their keep-alive connection
+            if response is not None:
+                response.close()
         
         return news_items
     
-    def fetch_all_news(self, hours_back: int = 24) -> List[NewsItem]:
-        """Fetch news from all enabled sources."""
-        all_news = []
-        cutoff_time = datetime.now() - timedelta(hours=hours_back)
+    def _fast_parse(self, source, source_name: str) -> List[NewsItem]:
+        """Stream-parse an RSS 2.0 or Atom feed with ElementTree.
+        Reading stops once MAX_ENTRIES_PER_FEED entries have been parsed. Raises if
+        the document isn't well-formed, isn't one of those formats or has an entry
+        date it can't read, so the caller can fall back to feedparser."""
+        news_items = []
+        entry_count = 0
         
+        for _, entry in ET.iterparse(source):
+            if entry.tag == 'item':
+                extract_fields = self._rss_item_fields
+            elif entry.tag == f'{{{_ATOM_NS}}}entry':
+                extract_fields = self._atom_entry_fields
+            else:
+                continue
+            
+            entry_count += 1
+            try:
+                title, summary, link, published, image_url = extract_fields(entry)
+                
+                if not title or not link:
+                    raise ValueError("entry has no title or link")
+                
+                # Skip articles older than 48 hours (expanded for high-volume)
+                if published >= datetime.now() - timedelta(hours=48):
+                    news_items.append(NewsItem(
+                        title=title,
+                        summary=summary or title,
+                        url=link,
+                        published=published,
+                        source=source_name,
+                        image_url=image_url
+                    ))
+                
+            except _UnparsedDateError:
+                # Dropping the entry would lose it silently; reparse the feed instead
+                raise
+            except Exception as e:
+                logger.error("Error parsing entry from %s: %s", source_name, e)
+            
+            # Entries are done with once extracted; free their subtrees as we go
+            entry.clear()
+            if entry_count >= MAX_ENTRIES_PER_FEED:
+                break
+        
+        if not entry_count:
+            raise ValueError("no RSS items or Atom entries found")
+        
+        return news_items
+    
+    def _rss_item_fields(self, item) -> Tuple:
+        """Extract (title, summary, link, published, image_url) from an RSS <item>."""
+        title = html.unescape((item.findtext('title') or '').strip())
+        link = (item.findtext('link') or '').strip()
+        summary = item.findtext('description')
+        
+        published = datetime.now()
+        pub_date = item.findtext('pubDate')
+        dc_date = item.findtext(f'{{{_DC_NS}}}date')
+        try:
+            if pub_date:
+                published = _to_naive_utc(parsedate_to_datetime(pub_date.strip()))
+            elif dc_date:
+                published = _parse_iso_date(dc_date)
+        except (TypeError, ValueError, IndexError, OverflowError) as e:
+            raise _UnparsedDateError(f"unparseable entry date {pub_date or dc_date!r}") from e
+        
+        image_url = None
+        media = item.find(f'{{{_MEDIA_NS}}}content')
+        if media is not None:
+            image_url = media.get('url')
+        else:
+            for enclosure in item.findall('enclosure'):
+                if enclosure.get('type', '').startswith('image/'):
+                    image_url = enclosure.get('url')
+                    break
+        
+        return title, summary, link, published, image_url
+    
+    def _atom_entry_fields(self, entry) -> Tuple:
+        """Extract (title, summary, link, published, image_url) from an Atom <entry>."""
+        title = html.unescape((entry.findtext(f'{{{_ATOM_NS}}}title') or '').strip())
+        summary = (entry.findtext(f'{{{_ATOM_NS}}}summary')
+                   or entry.findtext(f'{{{_ATOM_NS}}}content'))
+        
+        link = ''
+        for link_el in entry.findall(f'{{{_ATOM_NS}}}link'):
+            if link_el.get('rel', 'alternate') == 'alternate':
+                link = link_el.get('href', '')
+                break
+        
+        published = datetime.now()
+        date_text = (entry.findtext(f'{{{_ATOM_NS}}}published')
+                     or entry.findtext(f'{{{_ATOM_NS}}}updated'))
+        if date_text:
+            try:
+                published = _parse_iso_date(date_text)
+            except (ValueError, OverflowError) as e:
+                raise _UnparsedDateError(f"unparseable entry date {date_text!r}") from e
+        
+        image_url = None
+        media = entry.find(f'{{{_MEDIA_NS}}}content')
+        if media is not None:
+            image_url = media.get('url')
+        
+        return title, summary, link, published, image_url
+    
+    def _feedparser_parse(self, content: bytes, source_name: str) -> List[NewsItem]:
+        """Parse a feed with feedparser (handles malformed and less common formats)."""
+        news_items = []
+        feed = feedparser.parse(content)
+        
+        if feed.bozo:
+            logger.warning("RSS feed from %s has parsing issues", source_name)
+        
+        for entry in feed.entries[:MAX_ENTRIES_PER_FEED]:
+            try:
+                # Parse publication date
+                published = datetime.now()
+                if hasattr(entry, 'published_parsed') and entry.published_parsed:
+                    published = datetime(*entry.published_parsed[:6])
+                elif hasattr(entry, 'updated_parsed') and entry.updated_parsed:
+                    published = datetime(*entry.updated_parsed[:6])
+                
+                # Skip articles older than 48 hours (expanded for high-volume)
+                if published < datetime.now() - timedelta(hours=48):
+                    continue
+                
+                # Extract image URL if available
+                image_url = None
+                if hasattr(entry, 'media_content') and entry.media_content:
+                    image_url = entry.media_content[0].get('url')
+                elif hasattr(entry, 'enclosures') and entry.enclosures:
+                    for enclosure in entry.enclosures:
+                        if enclosure.type.startswith('image/'):
+                            image_url = enclosure.href
+                            break
+                
+                # Create news item
+                news_item = NewsItem(
+                    title=entry.title,
+                    summary=entry.get('summary', entry.title),
+                    url=entry.link,
+                    published=published,
+                    source=source_name,
+                    image_url=image_url
+                )
+                
+                news_items.append(news_item)
+                
+            except Exception as e:
+                logger.error("Error parsing entry from %s: %s", source_name, e)
+                continue
+        
+        return news_items
+    
+    def _fetch_enabled_sources(self):
+        """Fetch all enabled sources, yielding each source's articles as it completes.
+        Feeds are fetched concurrently, so total time is roughly that of the
+        slowest source rather than the sum of all of them."""
+        rss_sources = []
         for source_name, source_config in NEWS_SOURCES.items():
             if not source_config.get('enabled', False):
-                logger.info(f"Skipping disabled source: {source_name}")
+                logger.info("Skipping disabled source: %s", source_name)
                 continue
-            
+            if 'rss_url' in source_config:
+                rss_sources.append((source_name, source_config['rss_url']))
+        
+        if not rss_sources:
+            return
+        
+        futures = {
+            self._executor.submit(self.fetch_rss_feed, url, source_name): source_name
+            for source_name, url in rss_sources
+        }
+        
+        for future in as_completed(futures):
+            source_name = futures[future]
             try:
-                if 'rss_url' in source_config:
-                    news_items = self.fetch_rss_feed(
-                        source_config['rss_url'], 
-                        source_name
-                    )
-                    
-                    # Filter by time
-                    recent_news = [
-                        item for item in news_items 
-                        if item.published > cutoff_time
-                    ]
-                    
-                    all_news.extend(recent_news)
-                    
+                news_items = future.result()
             except Exception as e:
-                logger.error(f"Failed to fetch from {source_name}: {e}")
+                logger.error("Failed to fetch from %s: %s", source_name, e)
                 if not ERROR_SETTINGS['continue_on_source_error']:
                     raise
+                continue
+            
+            yield news_items
+    
+    def fetch_all_news(self, hours_back: int = 24) -> List[NewsItem]:
+        """Fetch news from all enabled sources."""
+        all_news = []
+        cutoff_time = datetime.now() - timedelta(hours=hours_back)
+        
+        for news_items in self._fetch_enabled_sources():
+            # Filter by time
+            all_news.extend(
+                item for item in news_items 
+                if item.published > cutoff_time
+            )
         
         # Remove duplicates based on title similarity
         all_news = self._remove_duplicates(all_news)
@@ -158,69 +418,95 @@ class CryptoNewsFetcher:
         # Sort by publication time (newest first)
         all_news.sort(key=lambda x: x.published, reverse=True)
         
-        logger.info(f"Total unique articles fetched: {len(all_news)}")
+        logger.info("Total unique articles fetched: %s", len(all_news))
         return all_news
     
+    def sample_recent(self, count: int, hours_back: int) -> List[NewsItem]:
+        """
+        Pick up to `count` random recent articles while the feeds stream in.
+        
+        Uses reservoir sampling (A-Res with equal weights) over a heap of
+        size `count`, so there is no full article list, fuzzy dedup pass or
+        sort. Repeated titles are skipped by exact normalized-title match.
+        
+        Args:
+            count: Number of articles to pick
+            hours_back: Only consider articles published within this window
+            
+        Returns:
+            List of up to `count` news items, in no particular order
+        """
+        if count <= 0:
+            return []
+        
+        cutoff_time = datetime.now() - timedelta(hours=hours_back)
+        reservoir = []  # min-heap of (random key, tie-breaker, item)
+        seen_titles = set()
+        
+        for news_items in self._fetch_enabled_sources():
+            for item in news_items:
+                if item.published <= cutoff_time or item.norm_title in seen_titles:
+                    continue
+                seen_titles.add(item.norm_title)
+                
+                entry = (random.random(), len(seen_titles), item)
+                if len(reservoir) < count:
+                    heapq.heappush(reservoir, entry)
+                elif entry[0] > reservoir[0][0]:
+                    heapq.heapreplace(reservoir, entry)
+        
+        return [item for _, _, item in reservoir]
+    
     def _remove_duplicates(self, news_items: List[NewsItem]) -> List[NewsItem]:
-        """Remove duplicate articles based on title similarity."""
+        """Remove duplicate articles based on title similarity.
+        Titles are similar when the words they share make up at least
+        TITLE_SIMILARITY_THRESHOLD of the shorter title. Kept titles are indexed
+        by word, so shared-word counts come from one pass over the index rather
+        than a set intersection per pair."""
         unique_news = []
-        seen_titles = set()
+        seen_titles = set()  # Exact normalized titles already kept
+        seen_word_sets = []
+        word_index = {}  # word -> positions in seen_word_sets
         
         for item in news_items:
-            # Simple duplicate detection based on normalized title
-            normalized_title = item.title.lower().strip()
+            # Same story re-posted under an identical title: no fuzzy check needed
+            if item.norm_title in seen_titles:
+                continue
             
-            # Remove common prefixes that might vary between sources
-            prefixes_to_remove = [
-                'breaking:', 'update:', 'news:', 'crypto:', 'bitcoin:',
-                'ethereum:', 'exclusive:', 'analysis:'
-            ]
+            words = item.token_set
             
-            for prefix in prefixes_to_remove:
-                if normalized_title.startswith(prefix):
-                    normalized_title = normalized_title[len(prefix):].strip()
+            # Shared-word count for every kept title that has any word in common
+            overlaps = Counter()
+            for word in words:
+                overlaps.update(word_index.get(word, ()))
             
-            # Check for similarity (simple approach)
-            is_duplicate = False
-            for seen_title in seen_titles:
-                if self._titles_similar(normalized_title, seen_title):
-                    is_duplicate = True
-                    break
+            is_duplicate = any(
+                overlap / min(len(words), len(seen_word_sets[i])) >= TITLE_SIMILARITY_THRESHOLD
+                for i, overlap in overlaps.items()
+            )
             
             if not is_duplicate:
-                seen_titles.add(normalized_title)
+                if words:
+                    seen_titles.add(item.norm_title)
+                for word in words:
+                    word_index.setdefault(word, []).append(len(seen_word_sets))
+                seen_word_sets.append(words)
                 unique_news.append(item)
         
         return unique_news
     
-    def _titles_similar(self, title1: str, title2: str, threshold: float = 0.7) -> bool:
-        """Check if two titles are similar (simple word overlap method)."""
-        words1 = set(title1.split())
-        words2 = set(title2.split())
-        
-        if not words1 or not words2:
-            return False
-        
-        overlap = len(words1.intersection(words2))
-        similarity = overlap / min(len(words1), len(words2))
-        
-        return similarity >= threshold
-    
     def get_random_recent_news(self, count: int = 1) -> List[NewsItem]:
         """Get random recent news items for posting."""
-        all_news = self.fetch_all_news(hours_back=6)  # Last 6 hours for freshness
+        news_items = self.sample_recent(count, hours_back=6)  # Last 6 hours for freshness
         
-        if not all_news:
+        if not news_items:
             logger.warning("No recent news found, fetching from last 24 hours")
-            all_news = self.fetch_all_news(hours_back=24)
+            news_items = self.sample_recent(count, hours_back=24)
         
-        if not all_news:
+        if not news_items:
             logger.error("No news articles found")
-            return []
         
-        # Select random articles
-        selected_count = min(count, len(all_news))
-        return random.sample(all_news, selected_count)
+        return news_items
 
 def test_news_fetcher():
     """Test function to verify news fetching works."""
@@ -240,4 +526,6 @@ def test_news_fetcher():
             print(f"   Image: {item.image_url}")
 
 if __name__ == "__main__":
+    from log import setup_logging
+    setup_logging()
     test_news_fetcher()
\ No newline at end of file
@@ -6,13 +6,51 @@ Transforms news headlines and summaries into engaging tweets
 import re
 import random
 import logging
+from bisect import bisect_right
+from functools import lru_cache
+from itertools import accumulate
 from typing import List, Dict, Optional
 from config import CONTENT_SETTINGS, CRYPTO_HASHTAGS, CRYPTO_ACCOUNTS
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Patterns are compiled once here rather than looked up on every tweet
+_HTML_RE = re.compile(r'<[^>]+>')
+
+# Common prefixes from news sites, stripped from the start of headlines
+_PREFIXES = (
+    'Breaking:', 'BREAKING:', 'Update:', 'UPDATE:', 'News:', 'NEWS:',
+    'Exclusive:', 'EXCLUSIVE:', 'Alert:', 'ALERT:', 'Analysis:',
+    'Opinion:', 'Editorial:', 'Report:', 'REPORT:'
+)
+# Any run of the prefixes above at the start of the text, with the whitespace after each
+_PREFIX_RE = re.compile(
+    r'(?:(?:' + '|'.join(map(re.escape, _PREFIXES)) + r')\s*)+'
+)
+
+# Convert passive to active voice (simple patterns)
+_STRUCT_PATTERNS = (
+    (re.compile(r'\bis expected to\b', re.IGNORECASE), 'will likely'),
+    (re.compile(r'\bare expected to\b', re.IGNORECASE), 'will likely'),
+    (re.compile(r'\bhas been\b', re.IGNORECASE), 'got'),
+    (re.compile(r'\bhave been\b', re.IGNORECASE), 'got'),
+)
+
+# Simplify complex phrases
+_PHRASE_PATTERNS = tuple(
+    (re.compile(r'\b' + re.escape(old_phrase) + r'\b', re.IGNORECASE), new_phrase)
+    for old_phrase, new_phrase in {
+        'in order to': 'to',
+        'despite the fact that': 'despite',
+        'due to the fact that': 'because',
+        'for the reason that': 'because',
+        'at this point in time': 'now',
+        'with regard to': 'about',
+        'in the event that': 'if',
+        'as a result of': 'from',
+    }.items()
+)
+
 class TweetRewriter:
     """Main class for rewriting news content into tweet format."""
     
@@ -39,6 +77,15 @@ class TweetRewriter:
             'platform': ['network', 'ecosystem', 'infrastructure']
         }
         
+        # One alternation over all synonym keys (longest first), so a single
+        # regex scan finds every replaceable word
+        self._synonym_re = re.compile(
+            r'\b(' + '|'.join(
+                map(re.escape, sorted(self.synonyms, key=len, reverse=True))
+            ) + r')\b',
+            re.IGNORECASE
+        )
+        
         # Action words to make tweets more engaging
         self.action_starters = [
             "🚨 Breaking:", "⚡ Alert:", "📈 Update:", "💎 News:",
@@ -47,6 +94,10 @@ class TweetRewriter:
             "🚀 Major news:", "💰 Financial update:", "🔔 Notice:"
         ]
         
+        # Hashtag pool and the cost of appending each one (leading space included)
+        self._hashtag_tuple = tuple(CRYPTO_HASHTAGS)
+        self._hashtag_lens = [len(h) + 1 for h in self._hashtag_tuple]
+        
         # Engaging endings
         self.engaging_endings = [
             "Thoughts?", "What do you think?", "Big news!", "Stay tuned!",
@@ -54,6 +105,10 @@ class TweetRewriter:
             "This could be huge!", "Exciting times!", "Keep watching!",
             "To the moon? 🚀", "WAGMI! 💎", "LFG! 🔥"
         ]
+        
+        # Cleaning and structural changes are deterministic, so they are memoized
+        # per title; the same headlines come back on every poll until they age out
+        self._prepare_title = lru_cache(maxsize=4096)(self._clean_and_restructure)
     
     def rewrite_headline(self, original_title: str, original_summary: str = "") -> str:
         """
@@ -68,7 +123,7 @@ class TweetRewriter:
         """
         try:
             # Clean and normalize the input
-            title = self._clean_text(original_title)
+            title = self._prepare_title(original_title)
             
             # Apply rewriting techniques
             rewritten = self._apply_rewriting_rules(title)
@@ -79,11 +134,11 @@ class TweetRewriter:
             # Ensure it meets length requirements
             final_tweet = self._ensure_length_limits(final_tweet)
             
-            logger.info(f"Rewritten: '{original_title}' -> '{final_tweet}'")
+            logger.info("Rewritten: '%s' -> '%s'", original_title, final_tweet)
             return final_tweet
             
         except Exception as e:
-            logger.error(f"Error rewriting headline: {e}")
+            logger.error("Error rewriting headline: %s", e)
             # Fallback: return cleaned original title
             return self._clean_text(original_title)[:200]
     
@@ -92,76 +147,44 @@ class TweetRewriter:
         if not text:
             return ""
         
-        # Remove HTML tags
-        text = re.sub(r'<[^>]+>', '', text)
+        # Remove HTML tags (most titles have none, so skip the regex then)
+        if '<' in text:
+            text = _HTML_RE.sub('', text)
         
         # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text).strip()
+        text = ' '.join(text.split())
         
         # Remove common prefixes from news sites
-        prefixes_to_remove = [
-            'Breaking:', 'BREAKING:', 'Update:', 'UPDATE:', 'News:', 'NEWS:',
-            'Exclusive:', 'EXCLUSIVE:', 'Alert:', 'ALERT:', 'Analysis:',
-            'Opinion:', 'Editorial:', 'Report:', 'REPORT:'
-        ]
-        
-        for prefix in prefixes_to_remove:
-            if text.startswith(prefix):
-                text = text[len(prefix):].strip()
+        match = _PREFIX_RE.match(text)
+        if match:
+            text = text[match.end():]
         
         return text
     
+    def _clean_and_restructure(self, text: str) -> str:
+        """Clean text and apply structural changes (memoized as _prepare_title)."""
+        return self._apply_structural_changes(self._clean_text(text))
+    
     def _apply_rewriting_rules(self, text: str) -> str:
-        """Apply synonym replacement and structural changes."""
-        words = text.split()
-        rewritten_words = []
-        
-        for word in words:
-            # Clean word (remove punctuation for matching)
-            clean_word = re.sub(r'[^\w]', '', word.lower())
-            
-            # Check for synonyms
-            replacement = word
-            for key, synonyms in self.synonyms.items():
-                if clean_word == key:
-                    replacement = random.choice(synonyms)
-                    # Preserve capitalization pattern
-                    if word[0].isupper():
-                        replacement = replacement.capitalize()
-                    break
-            
-            rewritten_words.append(replacement)
-        
-        rewritten_text = ' '.join(rewritten_words)
-        
-        # Apply structural changes
-        rewritten_text = self._apply_structural_changes(rewritten_text)
-        
-        return rewritten_text
+        """Apply synonym replacement (structural changes are applied by _prepare_title)."""
+        return self._synonym_re.sub(self._replace_synonym, text)
+    
+    def _replace_synonym(self, match: re.Match) -> str:
+        """Pick a random synonym for a matched word."""
+        word = match.group(0)
+        replacement = random.choice(self.synonyms[word.lower()])
+        # Preserve capitalization pattern
+        if word[0].isupper():
+            replacement = replacement.capitalize()
+        return replacement
     
     def _apply_structural_changes(self, text: str) -> str:
         """Apply structural changes to make text more tweet-friendly."""
+        for pattern, replacement in _STRUCT_PATTERNS:
+            text = pattern.sub(replacement, text)
         
-        # Convert passive to active voice (simple patterns)
-        text = re.sub(r'is expected to', 'will likely', text, flags=re.IGNORECASE)
-        text = re.sub(r'are expected to', 'will likely', text, flags=re.IGNORECASE)
-        text = re.sub(r'has been', 'got', text, flags=re.IGNORECASE)
-        text = re.sub(r'have been', 'got', text, flags=re.IGNORECASE)
-        
-        # Simplify complex phrases
-        replacements = {
-            'in order to': 'to',
-            'despite the fact that': 'despite',
-            'due to the fact that': 'because',
-            'for the reason that': 'because',
-            'at this point in time': 'now',
-            'with regard to': 'about',
-            'in the event that': 'if',
-            'as a result of': 'from',
-        }
-        
-        for old_phrase, new_phrase in replacements.items():
-            text = re.sub(old_phrase, new_phrase, text, flags=re.IGNORECASE)
+        for pattern, replacement in _PHRASE_PATTERNS:
+            text = pattern.sub(replacement, text)
         
         return text
     
@@ -194,15 +217,14 @@ class TweetRewriter:
         max_content_chars = CONTENT_SETTINGS['max_tweet_length'] - reserved_chars
         
         if len(text) > max_content_chars:
-            # Truncate at word boundary
-            words = text.split()
-            truncated = ""
-            for word in words:
-                if len(truncated + " " + word) <= max_content_chars - 3:  # -3 for "..."
-                    truncated += (" " if truncated else "") + word
-                else:
-                    break
-            text = truncated + "..."
+            # Offset just past each word's trailing space when joined with single spaces
+            word_ends = list(accumulate(len(word) + 1 for word in words))
+            if word_ends[-1] - 1 <= max_content_chars:
+                text = ' '.join(words)
+            else:
+                # Truncate at word boundary, leaving room for "..."
+                cut = bisect_right(word_ends, max_content_chars - 2)
+                text = ' '.join(words[:cut]) + '...'
         
         return text
     
@@ -210,35 +232,28 @@ class TweetRewriter:
         """Add hashtags and mentions to the tweet."""
         
         # Select random hashtags
-        num_hashtags = CONTENT_SETTINGS['hashtags_per_tweet']
-        selected_hashtags = random.sample(CRYPTO_HASHTAGS, 
-                                        min(num_hashtags, len(CRYPTO_HASHTAGS)))
+        num_hashtags = min(CONTENT_SETTINGS['hashtags_per_tweet'], len(self._hashtag_tuple))
+        indexes = random.sample(range(len(self._hashtag_tuple)), num_hashtags)
         
         # Select random mention if enabled
         mention = ""
         if CONTENT_SETTINGS['include_mentions'] and CRYPTO_ACCOUNTS:
             mention = random.choice(CRYPTO_ACCOUNTS)
         
-        # Combine everything
-        hashtags_str = " ".join(selected_hashtags)
-        
+        # Keep as many of the selected hashtags as fit in the remaining length
+        budget = CONTENT_SETTINGS['max_tweet_length'] - len(tweet_text)
         if mention:
-            final_tweet = f"{tweet_text} {mention} {hashtags_str}"
-        else:
-            final_tweet = f"{tweet_text} {hashtags_str}"
+            budget -= len(mention) + 1
+        hashtag_ends = list(accumulate(self._hashtag_lens[i] for i in indexes))
+        keep = bisect_right(hashtag_ends, budget)
         
-        # Final length check
-        if len(final_tweet) > CONTENT_SETTINGS['max_tweet_length']:
-            # Remove hashtags one by one until it fits
-            while len(final_tweet) > CONTENT_SETTINGS['max_tweet_length'] and selected_hashtags:
-                selected_hashtags.pop()
-                hashtags_str = " ".join(selected_hashtags)
-                if mention:
-                    final_tweet = f"{tweet_text} {mention} {hashtags_str}"
-                else:
-                    final_tweet = f"{tweet_text} {hashtags_str}"
+        # Combine everything
+        parts = [tweet_text]
+        if mention:
+            parts.append(mention)
+        parts.extend(self._hashtag_tuple[i] for i in indexes[:keep])
         
-        return final_tweet.strip()
+        return ' '.join(parts).strip()
     
     def create_complete_tweet(self, title: str, summary: str = "", url: str = "") -> str:
         """
@@ -284,4 +299,6 @@ def test_rewriter():
         print(f"   Length: {len(rewritten)} characters")
 
 if __name__ == "__main__":
+    from log import setup_logging
+    setup_logging()
     test_rewriter()
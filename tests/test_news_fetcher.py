@@ -0,0 +1,72 @@
+"""
+Tests for the RSS fast path in news_fetcher
+"""
+
+import io
+import os
+import sys
+import unittest
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from news_fetcher import CryptoNewsFetcher
+
+
+def _rss(pub_date: str) -> bytes:
+    return (
+        "<?xml version='1.0'?><rss version='2.0'><channel><title>Test</title>"
+        "<item><title>Bitcoin hits new high</title>"
+        "<link>https://example.com/btc</link>"
+        "<description>Summary</description>"
+        f"<pubDate>{pub_date}</pubDate></item>"
+        "</channel></rss>"
+    ).encode()
+
+
+class _FakeResponse:
+    """Just enough of a streamed requests response for fetch_rss_feed."""
+    
+    def __init__(self, body: bytes):
+        self.status_code = 200
+        self.headers = {}
+        self.raw = io.BytesIO(body)
+    
+    def raise_for_status(self):
+        pass
+    
+    def close(self):
+        pass
+
+
+class _FakeSession:
+    def __init__(self, body: bytes):
+        self._body = body
+    
+    def get(self, url, **kwargs):
+        return _FakeResponse(self._body)
+
+
+class MalformedPubDateTest(unittest.TestCase):
+    def setUp(self):
+        # Recent, but not RFC 822 as RSS requires
+        self.pub_date = (datetime.utcnow() - timedelta(hours=1)).strftime('%Y-%m-%d %H:%M:%S')
+        self.fetcher = CryptoNewsFetcher()
+    
+    def test_fast_parse_rejects_feed(self):
+        with self.assertRaises(ValueError):
+            self.fetcher._fast_parse(io.BytesIO(_rss(self.pub_date)), 'test')
+    
+    def test_entry_kept_via_feedparser_fallback(self):
+        self.fetcher.session = _FakeSession(_rss(self.pub_date))
+        items = self.fetcher.fetch_rss_feed('https://example.com/rss', 'test')
+        self.assertEqual([item.title for item in items], ['Bitcoin hits new high'])
+    
+    def test_valid_pub_date_uses_fast_path(self):
+        pub_date = (datetime.utcnow() - timedelta(hours=1)).strftime('%a, %d %b %Y %H:%M:%S +0000')
+        items = self.fetcher._fast_parse(io.BytesIO(_rss(pub_date)), 'test')
+        self.assertEqual([item.url for item in items], ['https://example.com/btc'])
+
+
+if __name__ == '__main__':
+    unittest.main()
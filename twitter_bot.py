@@ -5,32 +5,125 @@ Handles authentication, media upload, and tweet posting
 
 import tweepy
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import logging
-import tempfile
-import os
-from typing import Optional, Dict, Any
+import random
+import re
+import time
+import shutil
+from typing import Optional, Dict, Any, List, Tuple
 from PIL import Image
 import io
+from collections import OrderedDict, deque
+from itertools import islice
+from concurrent.futures import Future, ThreadPoolExecutor
 from config import (
     TWITTER_API_KEY, TWITTER_API_SECRET, TWITTER_ACCESS_TOKEN,
     TWITTER_ACCESS_TOKEN_SECRET, TWITTER_BEARER_TOKEN, 
     UNSPLASH_ACCESS_KEY, CONTENT_SETTINGS, ERROR_SETTINGS
 )
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Unsplash imgix parameters: 1200px wide (Twitter's timeline width) JPEG, sized server-side
+UNSPLASH_IMAGE_PARAMS = {'w': 1200, 'fm': 'jpg', 'q': 85}
+
+# Seconds a keyword's Unsplash search results are reused (search is rate-limited)
+UNSPLASH_SEARCH_TTL = 1800
+
+# Start of every JPEG file (SOI marker plus the first segment marker)
+JPEG_MAGIC = b'\xff\xd8\xff'
+
+# Twitter's size limit for image uploads
+MAX_IMAGE_UPLOAD_BYTES = 5 * 1024 * 1024
+
+# Unsplash photos remembered as already tweeted, so searches prefer new ones
+MAX_SEEN_IMAGES = 512
+
+# Tweet length weighting from twitter-text: code points in these ranges count
+# once, everything else (CJK, emoji, ...) twice, and any URL counts as a t.co
+# link of TCO_URL_LENGTH characters
+_LIGHT_RANGES = ((0x0000, 0x10FF), (0x2000, 0x200D), (0x2010, 0x201F), (0x2032, 0x2037))
+TCO_URL_LENGTH = 23
+_URL_RE = re.compile(r'https?://\S+')
+
+def _weighted_chars(text: str) -> int:
+    """Weighted length of text containing no URLs."""
+    if text.isascii():
+        return len(text)
+    return sum(
+        1 if any(low <= ord(char) <= high for low, high in _LIGHT_RANGES) else 2
+        for char in text
+    )
+
+def twitter_weighted_len(text: str) -> int:
+    """Length of text as Twitter counts it against the tweet limit."""
+    length = 0
+    position = 0
+    for match in _URL_RE.finditer(text):
+        length += _weighted_chars(text[position:match.start()]) + TCO_URL_LENGTH
+        position = match.end()
+    return length + _weighted_chars(text[position:])
+
+# Most tweet IDs the v2 tweet lookup endpoint accepts per request
+TWEET_LOOKUP_BATCH_SIZE = 100
+
+# Seconds a post waits for its prefetched image before going out without one
+MEDIA_WAIT_TIMEOUT = 30
+
+# Posted tweets TwitterBotManager keeps in memory
+MAX_TRACKED_TWEETS = 100
+
 class TwitterBot:
     """Main Twitter bot class for posting tweets with media."""
     
-    def __init__(self):
+    # Usernames confirmed by get_me(), keyed by a hash of the credentials, so
+    # bots created later in the same process skip that API round-trip
+    _verified_usernames: Dict[int, str] = {}
+    
+    def __init__(self, verify: bool = True):
+        """
+        Args:
+            verify: Check the credentials with get_me() (once per process)
+        """
         self.api_v1 = None
         self.api_v2 = None
         self.unsplash_session = requests.Session()
-        self._authenticate()
+        
+        # Keep-alive pool for the API and image hosts, with cheap retries on
+        # rate limiting and transient server errors
+        retries = Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+        pooled = HTTPAdapter(pool_connections=4, pool_maxsize=10, max_retries=retries)
+        self.unsplash_session.mount('https://', pooled)
+        
+        # Same connection pool without the retries, for the best-effort pre-warm
+        self._prewarm_adapter = HTTPAdapter(max_retries=0)
+        self._prewarm_adapter.poolmanager = pooled.poolmanager
+        self._unsplash_configured = (
+            bool(UNSPLASH_ACCESS_KEY) and UNSPLASH_ACCESS_KEY != 'your_unsplash_access_key_here'
+        )
+        if self._unsplash_configured:
+            self.unsplash_session.headers.update({
+                'Authorization': f"Client-ID {UNSPLASH_ACCESS_KEY}",
+                'Accept-Version': 'v1'
+            })
+        
+        # Text-only bots (images off or no Unsplash key) skip the image path entirely
+        self._images_enabled = bool(CONTENT_SETTINGS['attach_images']) and self._unsplash_configured
+        
+        # Recently used Unsplash photo IDs, oldest first (bounded LRU)
+        self._seen_image_ids = OrderedDict()
+        
+        # Per keyword: (monotonic time fetched, search results)
+        self._search_cache: Dict[str, Tuple[float, list]] = {}
+        
+        # Image fetch + upload runs here so it can overlap with composing the tweet
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='media')
+        
+        self._authenticate(verify)
     
-    def _authenticate(self):
+    def _authenticate(self, verify: bool = True):
         """Authenticate with Twitter API v1.1 and v2."""
         try:
             # Twitter API v1.1 (for media upload)
@@ -49,24 +142,53 @@ class TwitterBot:
             )
             
             # Test authentication
-            self._test_authentication()
+            if verify:
+                self._test_authentication()
             logger.info("Twitter API authentication successful")
             
         except Exception as e:
-            logger.error(f"Twitter API authentication failed: {e}")
+            logger.error("Twitter API authentication failed: %s", e)
             raise
     
     def _test_authentication(self):
         """Test Twitter API authentication."""
         try:
-            # Test v2 API
-            me = self.api_v2.get_me()
-            logger.info(f"Authenticated as: @{me.data.username}")
+            credentials_key = hash((TWITTER_ACCESS_TOKEN, TWITTER_BEARER_TOKEN))
+            username = TwitterBot._verified_usernames.get(credentials_key)
+            if username is None:
+                # Test v2 API
+                me = self.api_v2.get_me()
+                username = me.data.username
+                TwitterBot._verified_usernames[credentials_key] = username
+            logger.info("Authenticated as: @%s", username)
         except Exception as e:
-            logger.error(f"Authentication test failed: {e}")
+            logger.error("Authentication test failed: %s", e)
             raise
     
-    def fetch_crypto_image(self, keyword: str = "cryptocurrency") -> Optional[str]:
+    def prewarm(self) -> Optional[Future]:
+        """
+        Open pooled connections to the Unsplash API and image hosts in the
+        background, so the next post doesn't pay two TLS handshakes. Call it just
+        before a post: idle keep-alive connections are dropped by the server.
+        
+        Returns:
+            Future of the pre-warm, or None when images are disabled
+        """
+        if not self._images_enabled:
+            return None
+        return self._executor.submit(self._prewarm_unsplash)
+    
+    def _prewarm_unsplash(self):
+        """HEAD each Unsplash host once, without retries; failures are only logged
+        at debug level, and the real request then connects as usual."""
+        for url in ('https://api.unsplash.com/', 'https://images.unsplash.com/'):
+            try:
+                request = self.unsplash_session.prepare_request(requests.Request('HEAD', url))
+                self._prewarm_adapter.send(request, timeout=3).close()
+            except Exception as e:
+                logger.debug("Could not pre-connect to %s: %s", url, e)
+    
+    def fetch_crypto_image(self, keyword: str = "cryptocurrency") -> Optional[io.BytesIO]:
         """
         Fetch a crypto-related image from Unsplash.
         
@@ -74,92 +196,139 @@ class TwitterBot:
             keyword: Search keyword for images
             
         Returns:
-            Path to downloaded image file, or None if failed
+            In-memory JPEG ready for upload_media, or None if failed
         """
-        if not UNSPLASH_ACCESS_KEY or UNSPLASH_ACCESS_KEY == 'your_unsplash_access_key_here':
+        if not self._unsplash_configured:
             logger.warning("Unsplash API key not configured")
             return None
         
         try:
-            # Search for images on Unsplash
-            search_url = "https://api.unsplash.com/search/photos"
-            headers = {
-                "Authorization": f"Client-ID {UNSPLASH_ACCESS_KEY}"
-            }
-            params = {
-                "query": keyword,
-                "orientation": "landscape",
-                "per_page": 10,
-                "order_by": "relevant"
-            }
-            
-            response = self.unsplash_session.get(search_url, headers=headers, params=params, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
-            if not data.get('results'):
-                logger.warning(f"No images found for keyword: {keyword}")
+            results = self._search_images(keyword)
+            if not results:
+                logger.warning("No images found for keyword: %s", keyword)
                 return None
             
-            # Get a random image from results
-            import random
-            image_data = random.choice(data['results'])
-            image_url = image_data['urls']['regular']  # Use regular size (good for Twitter)
-            
-            # Download the image
-            image_response = self.unsplash_session.get(image_url, timeout=15)
-            image_response.raise_for_status()
-            
-            # Save to temporary file
-            temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.jpg')
+            # Get a random image from results, preferring ones not used recently
+            fresh = [result for result in results if result['id'] not in self._seen_image_ids]
+            image_data = random.choice(fresh or results)
+            self._remember_image(image_data['id'])
+            image_url = image_data['urls']['raw']
             
-            # Process image to ensure it meets Twitter requirements
-            image = Image.open(io.BytesIO(image_response.content))
+            # Download the image; Unsplash's CDN resizes to Twitter's display width and
+            # encodes the JPEG. The body is streamed straight into one buffer, and closing
+            # the response hands the connection back to the pool
+            download = io.BytesIO()
+            with self.unsplash_session.get(image_url, params=UNSPLASH_IMAGE_PARAMS,
+                                           timeout=15, stream=True) as image_response:
+                image_response.raise_for_status()
+                image_response.raw.decode_content = True
+                shutil.copyfileobj(image_response.raw, download, 64 * 1024)
+            download.seek(0)
             
-            # Resize if too large (Twitter max: 3MB, 3200x1800px)
-            if image.width > 3200 or image.height > 1800:
-                image.thumbnail((3200, 1800), Image.Resampling.LANCZOS)
+            # JPEGs within the upload limit (the usual case) go up exactly as downloaded,
+            # without being decoded at all
+            if not self._needs_reencode(download):
+                logger.info("Downloaded image: %s", image_url)
+                return download
             
-            # Convert to RGB if necessary
-            if image.mode != 'RGB':
-                image = image.convert('RGB')
-            
-            # Save optimized image
-            image.save(temp_file.name, 'JPEG', quality=85, optimize=True)
+            # Process image to ensure it meets Twitter requirements. The bot runs
+            # indefinitely, so Pillow's buffers are released explicitly
+            buffer = io.BytesIO()
+            with Image.open(download) as image:
+                # Convert to RGB if necessary
+                rgb_image = image if image.mode == 'RGB' else image.convert('RGB')
+                try:
+                    # Progressive JPEG stays small without the slow optimize pass
+                    rgb_image.save(buffer, 'JPEG', quality=85, optimize=False, progressive=True)
+                finally:
+                    if rgb_image is not image:
+                        rgb_image.close()
+            buffer.seek(0)
             
-            logger.info(f"Downloaded image: {image_url}")
-            return temp_file.name
+            logger.info("Downloaded image: %s", image_url)
+            return buffer
             
         except Exception as e:
-            logger.error(f"Error fetching image: {e}")
+            logger.error("Error fetching image: %s", e)
             return None
     
-    def upload_media(self, media_path: str) -> Optional[str]:
+    def _needs_reencode(self, data: io.BytesIO) -> bool:
+        """Check whether a downloaded image must be re-encoded before upload
+        (anything but a JPEG within Twitter's upload size limit)."""
+        view = data.getbuffer()
+        try:
+            return not (
+                view[:3] == JPEG_MAGIC and view.nbytes <= MAX_IMAGE_UPLOAD_BYTES
+            )
+        finally:
+            view.release()
+    
+    def _search_images(self, keyword: str) -> list:
+        """
+        Search Unsplash for landscape photos, reusing results for UNSPLASH_SEARCH_TTL.
+        
+        Args:
+            keyword: Search keyword for images
+            
+        Returns:
+            List of Unsplash photo results (possibly empty)
+        """
+        now = time.monotonic()
+        
+        # Forget keywords that haven't been searched for a while
+        expired = [key for key, (fetched_at, _) in self._search_cache.items()
+                   if now - fetched_at > 2 * UNSPLASH_SEARCH_TTL]
+        for key in expired:
+            del self._search_cache[key]
+        
+        cached = self._search_cache.get(keyword)
+        if cached and now - cached[0] < UNSPLASH_SEARCH_TTL:
+            return cached[1]
+        
+        # Search for images on Unsplash
+        search_url = "https://api.unsplash.com/search/photos"
+        params = {
+            "query": keyword,
+            "orientation": "landscape",
+            "per_page": 10,
+            "order_by": "relevant"
+        }
+        
+        with self.unsplash_session.get(search_url, params=params, timeout=10) as response:
+            response.raise_for_status()
+            results = response.json().get('results') or []
+        
+        self._search_cache[keyword] = (now, results)
+        return results
+    
+    def _remember_image(self, image_id: str):
+        """Mark an Unsplash photo as used, forgetting the oldest beyond MAX_SEEN_IMAGES."""
+        self._seen_image_ids[image_id] = None
+        self._seen_image_ids.move_to_end(image_id)
+        if len(self._seen_image_ids) > MAX_SEEN_IMAGES:
+            self._seen_image_ids.popitem(last=False)
+    
+    def upload_media(self, media: io.BytesIO) -> Optional[str]:
         """
         Upload media to Twitter and return media_id.
         
         Args:
-            media_path: Path to media file
+            media: In-memory JPEG (as returned by fetch_crypto_image); closed afterwards
             
         Returns:
             Media ID string, or None if failed
         """
         try:
-            # Upload media using API v1.1
-            media = self.api_v1.media_upload(filename=media_path)
-            logger.info(f"Media uploaded successfully: {media.media_id}")
-            return media.media_id
+            # Upload media using API v1.1 (filename only tells tweepy the file type)
+            uploaded = self.api_v1.media_upload(filename='crypto.jpg', file=media)
+            logger.info("Media uploaded successfully: %s", uploaded.media_id)
+            return uploaded.media_id
             
         except Exception as e:
-            logger.error(f"Error uploading media: {e}")
+            logger.error("Error uploading media: %s", e)
             return None
         finally:
-            # Clean up temp file
-            if os.path.exists(media_path):
-                try:
-                    os.unlink(media_path)
-                except:
-                    pass
+            media.close()
     
     def post_tweet(self, text: str, media_ids: Optional[list] = None) -> Optional[Dict[str, Any]]:
         """
@@ -180,7 +349,7 @@ class TwitterBot:
             )
             
             tweet_id = response.data['id']
-            logger.info(f"Tweet posted successfully: https://twitter.com/user/status/{tweet_id}")
+            logger.info("Tweet posted successfully: https://twitter.com/user/status/%s", tweet_id)
             
             return {
                 'id': tweet_id,
@@ -189,35 +358,62 @@ class TwitterBot:
             }
             
         except Exception as e:
-            logger.error(f"Error posting tweet: {e}")
+            logger.error("Error posting tweet: %s", e)
             return None
     
-    def post_tweet_with_image(self, text: str, image_keyword: str = None) -> Optional[Dict[str, Any]]:
+    def prefetch_media(self, image_keyword: str = None) -> Optional[Future]:
+        """
+        Start fetching and uploading an image in the background.
+        
+        Args:
+            image_keyword: Keyword for image search (optional)
+            
+        Returns:
+            Future resolving to the media ID (or None), or None if images are disabled
+            or Unsplash isn't configured
+        """
+        if not self._images_enabled:
+            return None
+        return self._executor.submit(self._fetch_and_upload_image, image_keyword)
+    
+    def _fetch_and_upload_image(self, image_keyword: str = None) -> Optional[str]:
+        """Fetch an Unsplash image and upload it, returning the media ID or None."""
+        if not image_keyword:
+            image_keyword = random.choice(CONTENT_SETTINGS['image_keywords'])
+        
+        image = self.fetch_crypto_image(image_keyword)
+        if image:
+            return self.upload_media(image)
+        return None
+    
+    def post_tweet_with_image(self, text: str, image_keyword: str = None,
+                              media_future: Optional[Future] = None) -> Optional[Dict[str, Any]]:
         """
         Post a tweet with an automatically fetched image.
         
         Args:
             text: Tweet text
             image_keyword: Keyword for image search (optional)
+            media_future: Upload already started with prefetch_media (optional)
             
         Returns:
             Tweet data if successful, None if failed
         """
-        media_ids = None
+        if media_future is None and not self._images_enabled:
+            return self.post_tweet(text)
         
-        # Try to attach image if enabled
-        if CONTENT_SETTINGS['attach_images']:
-            if not image_keyword:
-                image_keyword = random.choice(CONTENT_SETTINGS['image_keywords'])
-            
-            image_path = self.fetch_crypto_image(image_keyword)
-            if image_path:
-                media_id = self.upload_media(image_path)
-                if media_id:
-                    media_ids = [media_id]
+        # Attach the prefetched image, or fetch one now
+        media_id = None
+        if media_future is not None:
+            try:
+                media_id = media_future.result(timeout=MEDIA_WAIT_TIMEOUT)
+            except Exception as e:
+                logger.error("Error waiting for image upload: %s", e)
+        else:
+            media_id = self._fetch_and_upload_image(image_keyword)
         
         # Post tweet (with or without media)
-        return self.post_tweet(text, media_ids)
+        return self.post_tweet(text, [media_id] if media_id else None)
     
     def get_tweet_analytics(self, tweet_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -229,23 +425,39 @@ class TwitterBot:
         Returns:
             Analytics data if available
         """
-        try:
-            tweet = self.api_v2.get_tweet(
-                tweet_id,
-                tweet_fields=['public_metrics', 'created_at']
-            )
+        return self.get_tweets_analytics([tweet_id]).get(str(tweet_id))
+    
+    def get_tweets_analytics(self, tweet_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get basic analytics for many tweets, one API request per 100 IDs.
+        
+        Args:
+            tweet_ids: Twitter tweet IDs
             
-            if tweet.data:
-                return {
-                    'tweet_id': tweet_id,
-                    'created_at': tweet.data.created_at,
-                    'metrics': tweet.data.public_metrics
-                }
+        Returns:
+            Analytics data keyed by tweet ID (as a string), for tweets that were found
+        """
+        analytics = {}
+        
+        for start in range(0, len(tweet_ids), TWEET_LOOKUP_BATCH_SIZE):
+            batch = tweet_ids[start:start + TWEET_LOOKUP_BATCH_SIZE]
+            try:
+                response = self.api_v2.get_tweets(
+                    ids=batch,
+                    tweet_fields=['public_metrics', 'created_at']
+                )
+            except Exception as e:
+                logger.error("Error fetching tweet analytics: %s", e)
+                continue
             
-        except Exception as e:
-            logger.error(f"Error fetching tweet analytics: {e}")
+            for tweet in response.data or []:
+                analytics[str(tweet.id)] = {
+                    'tweet_id': str(tweet.id),
+                    'created_at': tweet.created_at,
+                    'metrics': tweet.public_metrics
+                }
         
-        return None
+        return analytics
     
     def delete_tweet(self, tweet_id: str) -> bool:
         """
@@ -259,22 +471,58 @@ class TwitterBot:
         """
         try:
             self.api_v2.delete_tweet(tweet_id)
-            logger.info(f"Tweet {tweet_id} deleted successfully")
+            logger.info("Tweet %s deleted successfully", tweet_id)
             return True
             
         except Exception as e:
-            logger.error(f"Error deleting tweet {tweet_id}: {e}")
+            logger.error("Error deleting tweet %s: %s", tweet_id, e)
             return False
+    
+    def delete_tweets(self, tweet_ids: List[str], concurrency: int = 8) -> List[bool]:
+        """
+        Delete several tweets, with up to `concurrency` requests in flight.
+        
+        Args:
+            tweet_ids: Twitter tweet IDs
+            concurrency: Maximum number of simultaneous delete requests
+            
+        Returns:
+            Per-ID success flags, in the order given
+        """
+        if not tweet_ids:
+            return []
+        
+        with ThreadPoolExecutor(max_workers=min(concurrency, len(tweet_ids))) as executor:
+            return list(executor.map(self.delete_tweet, tweet_ids))
 
 class TwitterBotManager:
     """High-level manager for Twitter bot operations."""
     
     def __init__(self):
-        self.bot = TwitterBot()
-        self.posted_tweets = []  # Track posted tweets
+        # Created on first use: building TwitterBot authenticates over the network
+        self._bot = None
+        # Track posted tweets; the oldest drop off once MAX_TRACKED_TWEETS are held
+        self.posted_tweets = deque(maxlen=MAX_TRACKED_TWEETS)
+    
+    @property
+    def bot(self) -> TwitterBot:
+        """The underlying TwitterBot, authenticated when first needed."""
+        if self._bot is None:
+            self._bot = TwitterBot()
+        return self._bot
+    
+    def prepare(self):
+        """Create the bot ahead of a posting run and pre-warm its Unsplash
+        connections, so that finishes while the news is still being fetched."""
+        self.bot.prewarm()
+    
+    def prefetch_media(self, image_keyword: str = None) -> Optional[Future]:
+        """Start the image fetch and upload for an upcoming post (see TwitterBot.prefetch_media)."""
+        return self.bot.prefetch_media(image_keyword)
     
     def post_crypto_news(self, tweet_text: str, news_url: str = "", 
-                        image_keyword: str = None) -> bool:
+                        image_keyword: str = None,
+                        media_future: Optional[Future] = None) -> bool:
         """
         Post a crypto news tweet with all enhancements.
         
@@ -282,39 +530,47 @@ class TwitterBotManager:
             tweet_text: The tweet content
             news_url: Optional news article URL
             image_keyword: Optional keyword for image search
+            media_future: Image upload already started with prefetch_media (optional)
             
         Returns:
             True if posted successfully, False otherwise
         """
         try:
-            # Add URL to tweet if provided and space allows
+            # Get the image going before anything else
+            if media_future is None:
+                media_future = self.bot.prefetch_media(image_keyword)
+            
+            # Add URL to tweet if provided, not already included, and space allows
+            # (measured the way Twitter counts, so the post isn't rejected as too long)
             final_text = tweet_text
-            if news_url and len(tweet_text) + len(news_url) + 1 <= CONTENT_SETTINGS['max_tweet_length']:
+            if (news_url and news_url not in tweet_text
+                    and twitter_weighted_len(tweet_text) + 1 + TCO_URL_LENGTH
+                    <= CONTENT_SETTINGS['max_tweet_length']):
                 final_text = f"{tweet_text} {news_url}"
             
             # Post tweet with image
-            result = self.bot.post_tweet_with_image(final_text, image_keyword)
+            result = self.bot.post_tweet_with_image(final_text, media_future=media_future)
             
             if result:
                 self.posted_tweets.append(result)
-                logger.info(f"Successfully posted crypto news tweet: {result['id']}")
+                logger.info("Successfully posted crypto news tweet: %s", result['id'])
                 return True
             else:
                 logger.error("Failed to post crypto news tweet")
                 return False
                 
         except Exception as e:
-            logger.error(f"Error in post_crypto_news: {e}")
+            logger.error("Error in post_crypto_news: %s", e)
             return False
     
     def get_recent_tweets(self, count: int = 10) -> list:
         """Get recently posted tweets."""
-        return self.posted_tweets[-count:] if self.posted_tweets else []
+        return list(islice(self.posted_tweets, max(0, len(self.posted_tweets) - count), None))
     
     def cleanup_old_data(self, keep_last: int = 100):
         """Keep only the last N tweets in memory."""
-        if len(self.posted_tweets) > keep_last:
-            self.posted_tweets = self.posted_tweets[-keep_last:]
+        while len(self.posted_tweets) > keep_last:
+            self.posted_tweets.popleft()
 
 def test_twitter_bot():
     """Test Twitter bot functionality."""
@@ -324,12 +580,10 @@ def test_twitter_bot():
         
         # Test image fetching
         print("Testing image fetching...")
-        image_path = bot.fetch_crypto_image("bitcoin")
-        if image_path:
-            print(f"✅ Image fetched: {image_path}")
-            # Clean up
-            if os.path.exists(image_path):
-                os.unlink(image_path)
+        image = bot.fetch_crypto_image("bitcoin")
+        if image:
+            print(f"✅ Image fetched: {len(image.getbuffer())} bytes")
+            image.close()
         else:
             print("⚠️  Image fetching failed (check Unsplash API key)")
         
@@ -339,4 +593,6 @@ def test_twitter_bot():
         print(f"❌ Twitter bot test failed: {e}")
 
 if __name__ == "__main__":
+    from log import setup_logging
+    setup_logging()
     test_twitter_bot()
\ No newline at end of file